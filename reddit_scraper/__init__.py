@@ -24,6 +24,7 @@ Usage:
 __version__ = '1.0.0'
 __author__ = 'reddit-scraper contributors'
 
+from reddit_scraper.comments import Comment
 from reddit_scraper.scraper import scrape_reddit_post
 
-__all__ = ['scrape_reddit_post']
+__all__ = ['Comment', 'scrape_reddit_post']
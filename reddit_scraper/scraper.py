@@ -4,13 +4,50 @@ Reddit Comment Scraper with Hierarchy Preservation
 Uses Reddit JSON API - No LLM costs, gets 100% of comments!
 
 Usage:
-    python -m reddit_scraper.scraper <reddit_url>
+    python -m reddit_scraper.scraper [--pretty] <reddit_url>
 """
 
-import json
+import argparse
+import asyncio
 import sys
+import httpx
+import orjson
 import requests
 from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from reddit_scraper.comments import Comment, parse_comments
+
+# HTTP settings shared by the sync and async fetch paths
+REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; RedditScraper/1.0)'}
+REQUEST_TIMEOUT_SECONDS = 30
+COMMENT_LIMIT = 500
+
+# Hosts rewritten to old.reddit.com before fetching
+OLD_REDDIT_HOST = 'old.reddit.com'
+REDDIT_HOSTS = frozenset({'reddit.com', 'www.reddit.com'})
+
+# Reused across calls so repeat scrapes skip DNS/TCP/TLS setup
+_session = requests.Session()
+_session.headers.update(REQUEST_HEADERS)
+
+
+def to_old_reddit_url(url: str) -> str:
+    """Convert a reddit.com or www.reddit.com URL to old.reddit.com"""
+    parts = urlsplit(url)
+    if parts.netloc.lower() not in REDDIT_HOSTS:
+        return url
+    return urlunsplit(parts._replace(netloc=OLD_REDDIT_HOST))
+
+
+def to_json_url(url: str) -> str:
+    """Add .json to a post URL's path to get the JSON API"""
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(
+        path=parts.path.rstrip('/') + '.json',
+        query=f'limit={COMMENT_LIMIT}',
+        fragment=''
+    ))
 
 
 def scrape_reddit_post(url: str) -> Dict:
@@ -21,26 +58,87 @@ def scrape_reddit_post(url: str) -> Dict:
         url: Reddit post URL (reddit.com or old.reddit.com)
 
     Returns:
-        Dict containing post data and hierarchical comments
+        Dict containing post data and a tree of Comment objects
+    """
+    url = to_old_reddit_url(url)
+    json_url = to_json_url(url)
+    print(f"🌐 Fetching from JSON API: {json_url}", file=sys.stderr)
+
+    return _parse_thread(_fetch_json(json_url), url)
+
+
+async def scrape_reddit_post_async(
+    url: str,
+    client: httpx.AsyncClient,
+    limiter: Optional[asyncio.Semaphore] = None
+) -> Dict:
     """
-    # Convert to old.reddit.com if needed
-    if 'reddit.com' in url:
-        url = url.replace('www.reddit.com', 'old.reddit.com')
-        if 'old.reddit.com' not in url:
-            url = url.replace('reddit.com', 'old.reddit.com')
+    Async variant of scrape_reddit_post using a shared, pooled HTTP client.
 
-    # Add .json to get the JSON API
-    json_url = url.rstrip('/') + '.json?limit=500'
+    Args:
+        url: Reddit post URL (reddit.com or old.reddit.com)
+        client: Long-lived httpx.AsyncClient whose connections are reused
+        limiter: Optional semaphore bounding concurrent requests to Reddit
 
+    Returns:
+        Dict containing post data and a tree of Comment objects
+    """
+    url = to_old_reddit_url(url)
+    json_url = to_json_url(url)
     print(f"🌐 Fetching from JSON API: {json_url}", file=sys.stderr)
 
-    # Fetch the JSON data
-    headers = {'User-Agent': 'Mozilla/5.0 (compatible; RedditScraper/1.0)'}
-    response = requests.get(json_url, headers=headers, timeout=30)
+    if limiter is None:
+        body = await _fetch_body_async(json_url, client)
+    else:
+        async with limiter:
+            body = await _fetch_body_async(json_url, client)
+
+    # Decoding and parsing are CPU-bound; keep them off the event loop.
+    # They run as two jobs so the raw body is freed before the tree is built.
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(None, orjson.loads, body)
+    del body
+    return await loop.run_in_executor(None, _parse_thread, data, url)
+
+
+def _fetch_json(json_url: str) -> List:
+    """
+    Fetch and decode a JSON API URL with the shared session.
+
+    The response (and its raw body) is released on return, so it is not
+    kept alive alongside the parsed comment tree.
+    """
+    response = _session.get(json_url, timeout=REQUEST_TIMEOUT_SECONDS)
     response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def _fetch_body_async(json_url: str, client: httpx.AsyncClient) -> bytearray:
+    """
+    Stream a JSON API URL into one buffer.
+
+    Chunks are appended to a single bytearray as they arrive instead of
+    being buffered by httpx and copied again.
+    """
+    body = bytearray()
+    async with client.stream('GET', json_url) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+    return body
 
-    data = response.json()
 
+def _parse_thread(data: List, url: str) -> Dict:
+    """
+    Parse the raw JSON API payload into post metadata and a comment tree.
+
+    Args:
+        data: Decoded JSON from the Reddit API
+        url: The old.reddit.com post URL the data was fetched from
+
+    Returns:
+        Dict containing post data and a tree of Comment objects
+    """
     # Reddit JSON API returns [post_listing, comments_listing]
     post_data_raw = data[0]['data']['children'][0]['data']
     comments_data_raw = data[1]['data']['children']
@@ -50,8 +148,8 @@ def scrape_reddit_post(url: str) -> Dict:
     # Extract post metadata
     post_data = {
         'title': post_data_raw.get('title', 'Unknown'),
-        'author': post_data_raw.get('author', 'Unknown'),
-        'subreddit': post_data_raw.get('subreddit', 'Unknown'),
+        'author': sys.intern(post_data_raw.get('author', 'Unknown')),
+        'subreddit': sys.intern(post_data_raw.get('subreddit', 'Unknown')),
         'timestamp': post_data_raw.get('created_utc', 0),
         'score': post_data_raw.get('score', 0),
         'url': url,
@@ -59,100 +157,78 @@ def scrape_reddit_post(url: str) -> Dict:
         'selftext': post_data_raw.get('selftext', '')
     }
 
-    # Parse comments recursively
-    def parse_comment(comment_obj: Dict) -> Optional[Dict]:
-        """Recursively parse a comment and its replies"""
-        if comment_obj['kind'] != 't1':  # Not a comment (might be 'more')
-            return None
-
-        comment_data = comment_obj['data']
-
-        # Build the comment object
-        comment = {
-            'id': comment_data.get('id', ''),
-            'author': comment_data.get('author', '[deleted]'),
-            'timestamp': comment_data.get('created_utc', 0),
-            'score': comment_data.get('score', 0),
-            'text': comment_data.get('body', ''),
-            'replies': []
-        }
-
-        # Add flair if present
-        if comment_data.get('author_flair_text'):
-            comment['author'] = f"{comment['author']} ({comment_data['author_flair_text']})"
-
-        # Parse replies recursively
-        if 'replies' in comment_data and comment_data['replies']:
-            if isinstance(comment_data['replies'], dict):
-                reply_children = comment_data['replies'].get('data', {}).get('children', [])
-                for reply_obj in reply_children:
-                    reply = parse_comment(reply_obj)
-                    if reply:
-                        comment['replies'].append(reply)
-
-        return comment
-
-    # Parse all top-level comments
-    comments_list = []
-    for comment_obj in comments_data_raw:
-        comment = parse_comment(comment_obj)
-        if comment:
-            comments_list.append(comment)
-
-    # Count total comments (including replies)
-    def count_all(comments):
-        total = len(comments)
-        for comment in comments:
-            total += count_all(comment.get('replies', []))
-        return total
-
-    total_comments = count_all(comments_list)
-    print(f"✅ Extracted {total_comments} total comments (including replies)", file=sys.stderr)
+    comments_list, stats = parse_comments(comments_data_raw)
+
+    print(f"✅ Extracted {stats['total']} total comments (including replies)", file=sys.stderr)
     print(f"📊 Post says {post_data['num_comments']} comments total", file=sys.stderr)
 
     return {
         'post': post_data,
-        'comments': comments_list
+        'comments': comments_list,
+        '_stats': stats
     }
 
 
-def print_comment_tree(comments: List[Dict], indent: int = 0):
-    """Pretty print the comment tree"""
-    for comment in comments:
-        prefix = "  " * indent + "└─ " if indent > 0 else "• "
-        print(f"{prefix}{comment['author']} ({comment['score']} points)", file=sys.stderr)
-
-        if comment.get('replies'):
-            print_comment_tree(comment['replies'], indent + 1)
-
-
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python -m reddit_scraper.scraper <reddit_url>", file=sys.stderr)
-        sys.exit(1)
-
-    url = sys.argv[1]
+def print_comment_tree(comments: List[Comment], indent: int = 0):
+    """Pretty print the comment tree to stderr with a single write"""
+    lines = []
+    pending = [(comment, indent) for comment in reversed(comments)]
+    while pending:
+        comment, depth = pending.pop()
+        prefix = "  " * depth + "└─ " if depth > 0 else "• "
+        lines.append(f"{prefix}{comment.author} ({comment.score} points)\n")
+        pending.extend((reply, depth + 1) for reply in reversed(comment.replies))
+    sys.stderr.write(''.join(lines))
+
+
+def _print_summary(result: Dict) -> None:
+    """Pretty print the post summary and comment tree to stderr"""
+    print("\n" + "="*80, file=sys.stderr)
+    print("📝 POST SUMMARY", file=sys.stderr)
+    print("="*80, file=sys.stderr)
+    print(f"Title: {result['post']['title']}", file=sys.stderr)
+    print(f"Author: {result['post']['author']}", file=sys.stderr)
+    print(f"Subreddit: r/{result['post']['subreddit']}", file=sys.stderr)
+    print(f"Score: {result['post']['score']}", file=sys.stderr)
+    print(f"Comments: {result['post']['num_comments']}", file=sys.stderr)
+
+    print("\n💬 COMMENT TREE", file=sys.stderr)
+    print("="*80, file=sys.stderr)
+    print_comment_tree(result['comments'])
+
+
+def main() -> None:
+    """Command-line entry point: scrape a URL and write its JSON to stdout"""
+    parser = argparse.ArgumentParser(
+        prog='reddit-scraper',
+        description='Scrape a Reddit thread and print it as JSON'
+    )
+    parser.add_argument('url', help='Reddit post URL (reddit.com or old.reddit.com)')
+    parser.add_argument(
+        '--pretty', action='store_true',
+        help='indent the JSON output (default when stdout is a terminal)'
+    )
+    args = parser.parse_args()
+
+    # Compact JSON when piped to another program; indent only for humans
+    json_options = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+    if args.pretty or sys.stdout.isatty():
+        json_options |= orjson.OPT_INDENT_2
 
     try:
-        result = scrape_reddit_post(url)
+        result = scrape_reddit_post(args.url)
 
         # Output the JSON to stdout (for API consumption)
-        print(json.dumps(result, indent=2))
+        sys.stdout.buffer.write(orjson.dumps(result, option=json_options))
+        sys.stdout.flush()
 
         # Pretty print to stderr (for human readability)
-        print("\n" + "="*80, file=sys.stderr)
-        print("📝 POST SUMMARY", file=sys.stderr)
-        print("="*80, file=sys.stderr)
-        print(f"Title: {result['post']['title']}", file=sys.stderr)
-        print(f"Author: {result['post']['author']}", file=sys.stderr)
-        print(f"Subreddit: r/{result['post']['subreddit']}", file=sys.stderr)
-        print(f"Score: {result['post']['score']}", file=sys.stderr)
-        print(f"Comments: {result['post']['num_comments']}", file=sys.stderr)
-
-        print("\n💬 COMMENT TREE", file=sys.stderr)
-        print("="*80, file=sys.stderr)
-        print_comment_tree(result['comments'])
+        _print_summary(result)
 
     except Exception as e:
         print(f"❌ Error: {e}", file=sys.stderr)
         sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
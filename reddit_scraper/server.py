@@ -12,95 +12,203 @@ API Endpoints:
     GET / - Simple web interface
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Dict, List
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Tuple
+from typing_extensions import Annotated
+import asyncio
+import functools
+import hashlib
+import os
 import re
+import sys
 from contextlib import asynccontextmanager
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+import msgspec
+import orjson
+from cachetools import TTLCache
+
+try:
+    import hypercorn.asyncio
+    from hypercorn.config import Config as HypercornConfig
+except ImportError:  # Optional: pip install reddit-scraper[http2]
+    hypercorn = None
+
+from reddit_scraper.comments import Comment
+from reddit_scraper.scraper import (
+    REQUEST_HEADERS,
+    REQUEST_TIMEOUT_SECONDS,
+    scrape_reddit_post_async,
+    to_old_reddit_url,
+)
 
-# Import scraper components
-import subprocess
-import json as json_module
-import sys
+# Address the server listens on
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8001
+
+# TLS certificate and key for HTTP/2 over TLS when served by hypercorn
+CERTFILE_ENV = "REDDIT_SCRAPER_CERTFILE"
+KEYFILE_ENV = "REDDIT_SCRAPER_KEYFILE"
+
+# Accepted shape of a (normalized) Reddit post URL
+_URL_RE = re.compile(r'https?://old\.reddit\.com/r/\w+/comments/')
+
+# Upper bound for a single scrape before giving up
+SCRAPE_TIMEOUT_SECONDS = 60
+
+# Connection pool shared by all outbound Reddit requests
+HTTP_POOL_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+# Maximum number of simultaneous requests to Reddit
+MAX_CONCURRENT_FETCHES = 8
+
+# Recently scraped threads, keyed by post URL without query or fragment
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SECONDS = 300
+_cache: TTLCache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+
+# One task per thread being fetched, so concurrent misses share one fetch
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib json module"""
+
+    def render(self, content: Any) -> bytes:
+        """Serialize content to JSON bytes"""
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
 
 
 # Startup/shutdown logic
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager for the API"""
+    base_url = _server_url()
     print("🚀 Reddit Scraper API starting...")
-    print("📍 Server running at: http://localhost:8001")
-    print("📖 API docs at: http://localhost:8001/docs")
-    print("🌐 Web interface at: http://localhost:8001")
-    yield
-    print("👋 Reddit Scraper API shutting down...")
+    print(f"📍 Server running at: {base_url}")
+    print(f"📖 API docs at: {base_url}/docs")
+    print(f"🌐 Web interface at: {base_url}")
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=HTTP_POOL_LIMITS,
+        timeout=REQUEST_TIMEOUT_SECONDS,
+        headers=REQUEST_HEADERS
+    )
+    app.state.reddit_sem = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    try:
+        yield
+    finally:
+        print("👋 Reddit Scraper API shutting down...")
+        await app.state.http.aclose()
 
 
 app = FastAPI(
     title="Reddit Scraper API",
     description="Extract Reddit threads with full comment hierarchy - NO LLM costs!",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
-class ScrapeRequest(BaseModel):
+class ScrapeRequest(msgspec.Struct):
     """Request model for scraping Reddit URLs"""
-    url: str = Field(..., description="Reddit post URL (reddit.com or old.reddit.com)")
+    url: Annotated[str, msgspec.Meta(description="Reddit post URL (reddit.com or old.reddit.com)")]
 
-    @field_validator('url')
-    @classmethod
-    def validate_reddit_url(cls, v: str) -> str:
+    def __post_init__(self) -> None:
         """Validate and normalize Reddit URLs"""
         # Convert to old.reddit.com automatically
-        if 'reddit.com' in v:
-            # Remove www. if present
-            v = v.replace('www.reddit.com', 'reddit.com')
-            # Convert to old.reddit.com
-            if 'old.reddit.com' not in v:
-                v = v.replace('reddit.com', 'old.reddit.com')
+        self.url = to_old_reddit_url(self.url)
 
         # Basic validation
-        if not re.match(r'https?://old\.reddit\.com/r/\w+/comments/', v):
+        if not _URL_RE.match(self.url):
             raise ValueError(
                 "Invalid Reddit URL. Expected format: "
                 "https://reddit.com/r/subreddit/comments/post_id/..."
             )
 
-        return v
+
+async def read_scrape_request(request: Request) -> ScrapeRequest:
+    """
+    Decode and validate a /scrape body straight into a ScrapeRequest.
+
+    msgspec decodes the raw JSON bytes into the Struct in one step, so the
+    body never goes through an intermediate dict or Pydantic validation.
+
+    Raises:
+        HTTPException: 422 if the body is not JSON or the URL is invalid
+    """
+    try:
+        return msgspec.json.decode(await request.body(), type=ScrapeRequest)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+# OpenAPI schema for the /scrape body, which FastAPI cannot infer from msgspec
+_SCRAPE_REQUEST_SCHEMA = msgspec.json.schema_components([ScrapeRequest])[1]['ScrapeRequest']
 
 
 class ScrapeResponse(BaseModel):
-    """Response model for scraped Reddit data"""
+    """Response model for scraped Reddit data (OpenAPI documentation only)"""
     success: bool
     url: str
     post: Dict
-    comments: List[Dict]
+    comments: List[Comment]
     stats: Dict = Field(default_factory=dict)
 
 
-def count_comments_recursive(comments: List[Dict], depth: int = 0, stats: Optional[Dict] = None) -> int:
-    """Count total comments and calculate stats"""
-    if stats is None:
-        stats = {'max_depth': 0, 'by_depth': {}}
+async def _scrape_and_cache(url: str) -> Dict:
+    """Scrape a thread with the client and semaphore on app.state and cache it"""
+    data = await scrape_reddit_post_async(url, app.state.http, app.state.reddit_sem)
+    _cache[url] = data
+    return data
 
-    total = 0
-    for comment in comments:
-        total += 1
-        stats['max_depth'] = max(stats['max_depth'], depth)
-        stats['by_depth'][depth] = stats['by_depth'].get(depth, 0) + 1
 
-        if comment.get('replies'):
-            total += count_comments_recursive(comment['replies'], depth + 1, stats)
+def _forget_inflight(key: str, task: asyncio.Task) -> None:
+    """Drop a finished fetch from _inflight unless it was already replaced"""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # Mark retrieved even if every waiter timed out
 
-    return total
 
+async def scrape_cached(url: str) -> Dict:
+    """
+    Return a scraped thread from the cache, fetching it on a miss.
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Simple web interface for testing the API"""
-    html_content = """
+    Concurrent misses for the same thread await one shared fetch task, so
+    they get its result or its exception without going upstream again.
+    The task is shielded: a waiter hitting its timeout does not cancel
+    the fetch for the others.
+
+    The query and fragment are dropped before the lookup and the scrape,
+    so a share token or comment anchor in one caller's URL is never
+    stored in post['url'] and returned to other callers.
+
+    Args:
+        url: Normalized old.reddit.com post URL
+
+    Returns:
+        Dict as returned by scrape_reddit_post_async
+    """
+    key = urlunsplit(urlsplit(url)._replace(query='', fragment=''))
+    data = _cache.get(key)
+    if data is not None:
+        return data
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.get_running_loop().create_task(_scrape_and_cache(key))
+        task.add_done_callback(functools.partial(_forget_inflight, key))
+        _inflight[key] = task
+    return await asyncio.shield(task)
+
+
+# Web interface served at GET /, encoded once at import time
+INDEX_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -435,7 +543,37 @@ async def root():
     </body>
     </html>
     """
-    return HTMLResponse(content=html_content)
+INDEX_HTML_BYTES = INDEX_HTML.encode('utf-8')
+INDEX_ETAG = '"' + hashlib.sha256(INDEX_HTML_BYTES).hexdigest()[:16] + '"'
+INDEX_CACHE_SECONDS = 3600
+INDEX_HEADERS = {
+    'Cache-Control': f'public, max-age={INDEX_CACHE_SECONDS}',
+    'ETag': INDEX_ETAG
+}
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (RFC 9110 weak comparison).
+
+    The header may list several entity tags, any of them weak (W/"..."),
+    or be '*' to match any current representation.
+    """
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == '*' or tag == etag:
+            return True
+    return False
+
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Simple web interface for testing the API"""
+    if _etag_matches(request.headers.get('if-none-match', ''), INDEX_ETAG):
+        return Response(status_code=304, headers=INDEX_HEADERS)
+    return Response(content=INDEX_HTML_BYTES, media_type='text/html', headers=INDEX_HEADERS)
 
 
 @app.get("/health")
@@ -453,8 +591,17 @@ async def health_check():
     })
 
 
-@app.post("/scrape", response_model=ScrapeResponse)
-async def scrape_reddit(request: ScrapeRequest):
+@app.post(
+    "/scrape",
+    responses={200: {"model": ScrapeResponse}},
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _SCRAPE_REQUEST_SCHEMA}}
+    }}
+)
+async def scrape_reddit(
+    request: ScrapeRequest = Depends(read_scrape_request)
+) -> ORJSONResponse:
     """
     Scrape a Reddit post and return structured data with full comment hierarchy.
 
@@ -473,38 +620,32 @@ async def scrape_reddit(request: ScrapeRequest):
     ```
     """
     try:
-        # Run the scraper as a module to avoid async/sync conflicts
-        python_exe = sys.executable
-
-        # Call the scraper module
-        result = subprocess.run(
-            [python_exe, '-m', 'reddit_scraper.scraper', request.url],
-            capture_output=True,
-            text=True,
-            timeout=60
+        data = await asyncio.wait_for(
+            scrape_cached(request.url),
+            timeout=SCRAPE_TIMEOUT_SECONDS
         )
 
-        if result.returncode != 0:
-            raise Exception(f"Scraper failed: {result.stderr}")
-
-        # Parse the JSON output
-        data = json_module.loads(result.stdout)
-
-        # Calculate statistics
-        stats_info = {'max_depth': 0, 'by_depth': {}}
-        total_comments = count_comments_recursive(data['comments'], stats=stats_info)
-
-        return ScrapeResponse(
-            success=True,
-            url=request.url,
-            post=data['post'],
-            comments=data['comments'],
-            stats={
-                'total_comments': total_comments,
+        # Statistics are collected by the scraper while parsing
+        stats_info = data['_stats']
+
+        # Scraped data is trusted, so skip re-validating it via ScrapeResponse
+        return ORJSONResponse({
+            'success': True,
+            'url': request.url,
+            'post': data['post'],
+            'comments': data['comments'],
+            'stats': {
+                'total_comments': stats_info['total'],
                 'top_level_comments': len(data['comments']),
                 'max_depth': stats_info['max_depth'],
                 'comments_by_depth': stats_info['by_depth']
             }
+        })
+
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Timed out scraping Reddit post after {SCRAPE_TIMEOUT_SECONDS} seconds"
         )
 
     except Exception as e:
@@ -514,14 +655,63 @@ async def scrape_reddit(request: ScrapeRequest):
         )
 
 
-if __name__ == "__main__":
+def _tls_files() -> Optional[Tuple[str, str]]:
+    """
+    Read the TLS certificate and key paths from the environment.
+
+    Returns:
+        (certfile, keyfile), or None when neither variable is set
+
+    Raises:
+        ValueError: If only one of the two variables is set
+    """
+    certfile = os.environ.get(CERTFILE_ENV)
+    keyfile = os.environ.get(KEYFILE_ENV)
+    if bool(certfile) != bool(keyfile):
+        raise ValueError(
+            f"Set both {CERTFILE_ENV} and {KEYFILE_ENV} to serve over TLS, or neither"
+        )
+    return (certfile, keyfile) if certfile else None
+
+
+def _server_url() -> str:
+    """Base URL shown at startup; https only when hypercorn serves TLS"""
+    tls = hypercorn is not None and os.environ.get(CERTFILE_ENV) and os.environ.get(KEYFILE_ENV)
+    return f"{'https' if tls else 'http'}://localhost:{SERVER_PORT}"
+
+
+def _serve_hypercorn() -> None:
+    """Serve with hypercorn, negotiating HTTP/2 (h2 over TLS, or h2c)"""
+    try:
+        tls = _tls_files()
+    except ValueError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    config = HypercornConfig()
+    config.bind = [f"{SERVER_HOST}:{SERVER_PORT}"]
+    if tls is not None:
+        config.certfile, config.keyfile = tls
+    asyncio.run(hypercorn.asyncio.serve(app, config))
+
+
+def main() -> None:
+    """Run the API server, using hypercorn for HTTP/2 when it is installed"""
+    if hypercorn is not None:
+        _serve_hypercorn()
+        return
+
     import uvicorn
 
-    # Run the server
+    # uvicorn only speaks HTTP/1.1
     uvicorn.run(
         "reddit_scraper.server:app",
-        host="0.0.0.0",
-        port=8001,
+        host=SERVER_HOST,
+        port=SERVER_PORT,
         reload=False,
         log_level="info"
     )
+
+
+if __name__ == "__main__":
+    main()
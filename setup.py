@@ -37,8 +37,16 @@ setup(
         "uvicorn>=0.20.0",
         "pydantic>=2.0.0",
         "requests>=2.28.0",
+        "httpx[http2]>=0.24.0",
+        "orjson>=3.8.0",
+        "cachetools>=5.0.0",
+        "msgspec>=0.18.0",
+        "typing_extensions>=4.0.0",
     ],
     extras_require={
+        "http2": [
+            "hypercorn>=0.14.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
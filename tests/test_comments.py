@@ -0,0 +1,179 @@
+"""
+Tests for reddit_scraper.comments.
+
+The generated parser is checked against a copy of the original recursive
+parser and column by column, so changes to T1_COLUMNS or the generated
+source that alter the output show up here.
+"""
+
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+import pytest
+
+from reddit_scraper.comments import (
+    NO_PARENT,
+    T1_COLUMNS,
+    CommentTable,
+    _parse_table,
+    parse_comments,
+)
+
+
+def t1(comment_id: str, replies: List[Dict] = (), author: str = 'user',
+       flair: Optional[str] = None, score: int = 1) -> Dict:
+    """Build a raw t1 comment as returned by the Reddit JSON API"""
+    return {
+        'kind': 't1',
+        'data': {
+            'id': comment_id,
+            'author': author,
+            'author_flair_text': flair,
+            'created_utc': 1700000000.0,
+            'score': score,
+            'body': f'body of {comment_id}',
+            # Reddit sends '' rather than an empty Listing for no replies
+            'replies': {'kind': 'Listing', 'data': {'children': list(replies)}}
+                       if replies else '',
+        },
+    }
+
+
+def more(comment_id: str) -> Dict:
+    """Build a 'more' stub standing in for unloaded comments"""
+    return {'kind': 'more', 'data': {'id': comment_id, 'count': 3, 'children': []}}
+
+
+def reference_parse(children: List[Dict]) -> List[Dict]:
+    """The original recursive parser, kept as the expected behaviour"""
+    def parse_comment(comment_obj: Dict) -> Optional[Dict]:
+        if comment_obj['kind'] != 't1':
+            return None
+        comment_data = comment_obj['data']
+        comment = {
+            'id': comment_data.get('id', ''),
+            'author': comment_data.get('author', '[deleted]'),
+            'timestamp': comment_data.get('created_utc', 0),
+            'score': comment_data.get('score', 0),
+            'text': comment_data.get('body', ''),
+            'replies': []
+        }
+        if comment_data.get('author_flair_text'):
+            comment['author'] = f"{comment['author']} ({comment_data['author_flair_text']})"
+        if 'replies' in comment_data and comment_data['replies']:
+            if isinstance(comment_data['replies'], dict):
+                reply_children = comment_data['replies'].get('data', {}).get('children', [])
+                for reply_obj in reply_children:
+                    reply = parse_comment(reply_obj)
+                    if reply:
+                        comment['replies'].append(reply)
+        return comment
+
+    return [c for c in map(parse_comment, children) if c]
+
+
+def as_dicts(comments) -> List[Dict]:
+    return [asdict(comment) for comment in comments]
+
+
+@pytest.fixture
+def thread() -> List[Dict]:
+    return [
+        t1('a', author='alice', flair='Mod', replies=[
+            t1('a1', author='bob', replies=[
+                t1('a1x', author='alice', flair='Mod'),
+                more('a1m'),
+            ]),
+            t1('a2', score=-4),
+        ]),
+        more('top-more'),
+        t1('b', author='carol'),
+        t1('c', replies=[more('c-more')]),
+    ]
+
+
+def test_matches_reference_parser(thread):
+    comments, _ = parse_comments(thread)
+    assert as_dicts(comments) == reference_parse(thread)
+
+
+def test_flair_folded_into_author(thread):
+    comments, _ = parse_comments(thread)
+    assert comments[0].author == 'alice (Mod)'
+    assert comments[1].author == 'carol'
+
+
+def test_more_stubs_skipped(thread):
+    comments, stats = parse_comments(thread)
+    assert [c.id for c in comments] == ['a', 'b', 'c']
+    assert [c.id for c in comments[0].replies[0].replies] == ['a1x']
+    assert comments[2].replies == []
+    assert stats['total'] == 6
+
+
+def test_empty_string_replies():
+    comments, stats = parse_comments([t1('solo')])
+    assert comments[0].replies == []
+    assert stats == {'total': 1, 'max_depth': 0, 'by_depth': {0: 1}}
+
+
+def test_empty_listing():
+    assert parse_comments([]) == ([], {'total': 0, 'max_depth': 0, 'by_depth': {}})
+    assert parse_comments([more('only')])[0] == []
+
+
+def test_sibling_order_preserved():
+    children = [t1(str(i), replies=[t1(f'{i}.{j}') for j in range(5)])
+                for i in range(20)]
+    comments, _ = parse_comments(children)
+    assert [c.id for c in comments] == [str(i) for i in range(20)]
+    assert [r.id for r in comments[7].replies] == [f'7.{j}' for j in range(5)]
+
+
+def test_stats(thread):
+    _, stats = parse_comments(thread)
+    assert stats == {'total': 6, 'max_depth': 2, 'by_depth': {0: 3, 1: 2, 2: 1}}
+
+
+def test_deep_chain_does_not_recurse():
+    depth = 5000
+    node = t1(f'c{depth}')
+    for i in range(depth - 1, -1, -1):
+        node = t1(f'c{i}', replies=[node])
+    comments, stats = parse_comments([node])
+    assert stats['max_depth'] == depth
+    assert stats['by_depth'] == {d: 1 for d in range(depth + 1)}
+    for _ in range(depth):
+        comments = comments[0].replies
+    assert comments[0].id == f'c{depth}'
+
+
+def test_repeat_authors_share_one_string():
+    comments, _ = parse_comments([t1('x', author=''.join(['da', 've'])),
+                                  t1('y', author=''.join(['d', 'ave']))])
+    assert comments[0].author is comments[1].author
+
+
+def test_t1_columns_cover_table():
+    # authors, depths and parents are filled explicitly by the generated loop
+    explicit = {'authors', 'depths', 'parents'}
+    assert set(T1_COLUMNS) | explicit == set(CommentTable.__slots__)
+    assert not set(T1_COLUMNS) & explicit
+
+
+def test_parsed_row_fills_every_column():
+    table = _parse_table([
+        t1('r', author='dave', flair='Mod', score=7, replies=[t1('r1', score=-2)])
+    ])
+    expected = {
+        'ids': ['r', 'r1'],
+        'authors': ['dave (Mod)', 'user'],
+        'texts': ['body of r', 'body of r1'],
+        'timestamps': [1700000000.0, 1700000000.0],
+        'scores': [7, -2],
+        'depths': [0, 1],
+        'parents': [NO_PARENT, 0],
+    }
+    assert set(expected) == set(CommentTable.__slots__)
+    for column, values in expected.items():
+        assert list(getattr(table, column)) == values, column
@@ -0,0 +1,48 @@
+"""
+Tests for the URL helpers in reddit_scraper.scraper.
+"""
+
+import pytest
+
+from reddit_scraper.scraper import to_json_url, to_old_reddit_url
+
+OLD_URL = 'https://old.reddit.com/r/python/comments/abc/title/'
+
+
+@pytest.mark.parametrize('url', [
+    'https://www.reddit.com/r/python/comments/abc/title/',
+    'https://reddit.com/r/python/comments/abc/title/',
+    'https://WWW.Reddit.com/r/python/comments/abc/title/',
+    'https://REDDIT.COM/r/python/comments/abc/title/',
+])
+def test_reddit_hosts_rewritten(url):
+    assert to_old_reddit_url(url) == OLD_URL
+
+
+@pytest.mark.parametrize('url', [
+    OLD_URL,
+    # Only the host is rewritten, never a reddit.com string in the path
+    'https://old.reddit.com/r/python/comments/abc/www.reddit.com_is_down/',
+    'https://example.com/www.reddit.com/r/python/comments/abc/',
+    'https://np.reddit.com/r/python/comments/abc/title/',
+])
+def test_other_urls_unchanged(url):
+    assert to_old_reddit_url(url) == url
+
+
+def test_query_and_fragment_kept_by_host_rewrite():
+    url = 'https://www.reddit.com/r/python/comments/abc/title/?share_id=x#c9'
+    assert to_old_reddit_url(url) == OLD_URL + '?share_id=x#c9'
+
+
+@pytest.mark.parametrize('url', [
+    OLD_URL,
+    OLD_URL.rstrip('/'),
+    OLD_URL + '?share_id=x',
+    OLD_URL + '#c9',
+    OLD_URL + '?utm_source=share&sort=new#c9',
+])
+def test_json_url_replaces_query_and_fragment(url):
+    assert to_json_url(url) == (
+        'https://old.reddit.com/r/python/comments/abc/title.json?limit=500'
+    )
@@ -0,0 +1,210 @@
+"""
+Tests for reddit_scraper.server.
+
+Reddit is replaced by an httpx.MockTransport, so these run offline.
+"""
+
+import asyncio
+import functools
+
+import httpx
+import orjson
+import pytest
+from cachetools import TTLCache
+from fastapi.testclient import TestClient
+
+from reddit_scraper import server
+
+POST_URL = 'https://old.reddit.com/r/python/comments/abc/title/'
+
+THREAD_JSON = orjson.dumps([
+    {'kind': 'Listing', 'data': {'children': [{'kind': 't3', 'data': {
+        'title': 'Title',
+        'author': 'op',
+        'subreddit': 'python',
+        'created_utc': 1700000000.0,
+        'score': 10,
+        'num_comments': 1,
+        'selftext': '',
+    }}]}},
+    {'kind': 'Listing', 'data': {'children': [{'kind': 't1', 'data': {
+        'id': 'c1',
+        'author': 'alice',
+        'created_utc': 1700000001.0,
+        'score': 3,
+        'body': 'first',
+        'replies': '',
+    }}]}},
+])
+
+
+class FakeReddit:
+    """MockTransport handler that counts requests and can stall or fail"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.urls = []
+        self.status = 200
+        self.delay = 0.0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        self.urls.append(str(request.url))
+        await asyncio.sleep(self.delay)
+        return httpx.Response(self.status, content=THREAD_JSON)
+
+
+@pytest.fixture
+def reddit(monkeypatch) -> FakeReddit:
+    """Point the server's HTTP client at a FakeReddit and start with no cache"""
+    fake = FakeReddit()
+    client = functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(fake))
+    monkeypatch.setattr(server.httpx, 'AsyncClient', client)
+    monkeypatch.setattr(server, '_cache', TTLCache(maxsize=8, ttl=60))
+    monkeypatch.setattr(server, '_inflight', {})
+    return fake
+
+
+def run(main):
+    """Run main() inside the app lifespan, as a request handler would"""
+    async def runner():
+        async with server.lifespan(server.app):
+            return await main()
+    return asyncio.run(runner())
+
+
+def test_concurrent_misses_share_one_fetch(reddit):
+    reddit.delay = 0.05
+
+    async def main():
+        return await asyncio.gather(*(server.scrape_cached(POST_URL) for _ in range(10)))
+
+    results = run(main)
+    assert reddit.calls == 1
+    assert all(result is results[0] for result in results)
+    assert server._inflight == {}
+
+
+def test_upstream_error_reaches_every_waiter(reddit):
+    reddit.delay = 0.05
+    reddit.status = 503
+
+    async def main():
+        return await asyncio.gather(
+            *(server.scrape_cached(POST_URL) for _ in range(10)),
+            return_exceptions=True
+        )
+
+    results = run(main)
+    assert reddit.calls == 1
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+    assert server._inflight == {}
+    assert len(server._cache) == 0
+
+    # Failures are not cached, so the next miss goes upstream again
+    reddit.status = 200
+    run(lambda: server.scrape_cached(POST_URL))
+    assert reddit.calls == 2
+
+
+def test_waiter_timeout_does_not_cancel_fetch(reddit):
+    reddit.delay = 0.05
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(server.scrape_cached(POST_URL), timeout=0.01)
+        await server._inflight[POST_URL]
+
+    run(main)
+    assert reddit.calls == 1
+    assert POST_URL in server._cache
+    assert server._inflight == {}
+
+
+def test_query_and_fragment_share_one_entry(reddit):
+    async def main():
+        first = await server.scrape_cached(POST_URL + '?share_id=ALICE123#c9')
+        second = await server.scrape_cached(POST_URL)
+        return first, second
+
+    first, second = run(main)
+    assert reddit.calls == 1
+    assert second is first
+    assert first['post']['url'] == POST_URL
+
+
+@pytest.mark.parametrize('if_none_match', [
+    server.INDEX_ETAG,
+    'W/' + server.INDEX_ETAG,
+    '"stale", ' + server.INDEX_ETAG,
+    '"stale",W/' + server.INDEX_ETAG,
+    '*',
+])
+def test_index_not_modified(if_none_match):
+    response = TestClient(server.app).get('/', headers={'If-None-Match': if_none_match})
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['etag'] == server.INDEX_ETAG
+    assert response.headers['cache-control'] == server.INDEX_HEADERS['Cache-Control']
+
+
+@pytest.mark.parametrize('headers', [
+    {'If-None-Match': '"stale"'},
+    {'If-None-Match': server.INDEX_ETAG.strip('"')},
+    {},
+])
+def test_index_served_on_mismatch(headers):
+    response = TestClient(server.app).get('/', headers=headers)
+    assert response.status_code == 200
+    assert response.content == server.INDEX_HTML_BYTES
+    assert response.headers['etag'] == server.INDEX_ETAG
+
+
+@pytest.mark.parametrize('body', [
+    b'{"url": ',
+    b'{}',
+    b'{"url": 42}',
+    b'{"url": "https://example.com/r/python/comments/abc/title/"}',
+])
+def test_scrape_rejects_bad_body(body):
+    response = TestClient(server.app).post('/scrape', content=body)
+    assert response.status_code == 422
+    assert isinstance(response.json()['detail'], str)
+
+
+def test_scrape_normalizes_to_old_reddit(reddit):
+    with TestClient(server.app) as client:
+        response = client.post(
+            '/scrape', json={'url': 'https://www.reddit.com/r/python/comments/abc/title/'}
+        )
+    assert response.status_code == 200
+    assert response.json()['url'] == POST_URL
+    assert reddit.urls == [
+        'https://old.reddit.com/r/python/comments/abc/title.json?limit=500'
+    ]
+
+
+@pytest.mark.parametrize('env', [server.CERTFILE_ENV, server.KEYFILE_ENV])
+def test_tls_needs_both_files(monkeypatch, env):
+    monkeypatch.delenv(server.CERTFILE_ENV, raising=False)
+    monkeypatch.delenv(server.KEYFILE_ENV, raising=False)
+    monkeypatch.setenv(env, '/tmp/tls.pem')
+    with pytest.raises(ValueError, match='Set both'):
+        server._tls_files()
+
+
+def test_startup_url_scheme_follows_tls(monkeypatch):
+    monkeypatch.delenv(server.CERTFILE_ENV, raising=False)
+    monkeypatch.delenv(server.KEYFILE_ENV, raising=False)
+    monkeypatch.setattr(server, 'hypercorn', object())
+    assert server._tls_files() is None
+    assert server._server_url() == f'http://localhost:{server.SERVER_PORT}'
+
+    monkeypatch.setenv(server.CERTFILE_ENV, '/tmp/cert.pem')
+    monkeypatch.setenv(server.KEYFILE_ENV, '/tmp/key.pem')
+    assert server._tls_files() == ('/tmp/cert.pem', '/tmp/key.pem')
+    assert server._server_url() == f'https://localhost:{server.SERVER_PORT}'
+
+    # uvicorn ignores the certificate, so the banner stays on http
+    monkeypatch.setattr(server, 'hypercorn', None)
+    assert server._server_url() == f'http://localhost:{server.SERVER_PORT}'